@@ -0,0 +1,23 @@
+import os
+from functools import lru_cache
+
+from dotenv import find_dotenv
+
+
+@lru_cache(maxsize=1)
+def _environ():
+    """Snapshot os.environ once, after any .env file has been loaded"""
+    return dict(os.environ)
+
+
+def env(key, default=None):
+    """Return an environment variable from the process snapshot"""
+    return _environ().get(key, default)
+
+
+def dotenv_path():
+    """Return the .env file to load, or '' when there is none or the deployment already set the environment"""
+    if os.environ.get('SKIP_DOTENV') == '1' or os.environ.get('BOT_TOKEN'):
+        return ''
+    # Same upward search from this package that a bare load_dotenv() would do
+    return find_dotenv()
@@ -1,59 +1,357 @@
-import os
+import asyncio
 import logging
-import requests
+import aiohttp
+import orjson
 import re
 import hashlib
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import MappingProxyType
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
-from telegram.ext import Application, CommandHandler, MessageHandler, filters, CallbackContext, CallbackQueryHandler
+from telegram.ext import AIORateLimiter, Application, CommandHandler, MessageHandler, filters, CallbackContext, CallbackQueryHandler
 
-# Set up logging
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=logging.INFO
-)
+# Environment reads go through the same process snapshot as config.py
+try:
+    from ._env import env
+except ImportError:
+    from _env import env
+
+# Set up logging, unless the host process already configured it
+if not logging.getLogger().hasHandlers():
+    logging.basicConfig(
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        level=logging.INFO
+    )
 logger = logging.getLogger(__name__)
 
+@dataclass(slots=True, frozen=True)
+class Service:
+    """Static description of a URL shortening service"""
+    name: str
+    api_url: str
+    requires_key: bool
+    env_var: str = ''  # Environment variable holding the API key, if any
+
+# (key, name, api_url, requires_key, env_var) for every supported service.
+# A tuple of literals compiles to a single constant, so no dicts are built per entry.
+SERVICE_SPECS = (
+    ('bitly', 'Bitly', 'https://api-ssl.bitly.com/v4/shorten', True, 'BITLY_TOKEN'),
+    ('tinyurl', 'TinyURL', 'http://tinyurl.com/api-create.php', False, ''),
+    ('cuttly', 'Cuttly', 'https://cutt.ly/api/api.php', True, 'CUTTLY_API'),
+    ('gplinks', 'GPLinks', 'https://gplinks.in/api', True, 'GPLINKS_API'),
+)
+
+# URL validation pattern, compiled once at import
+_URL_PATTERN = re.compile(
+    r'^https?://'  # http:// or https://
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
+    r'localhost|'  # localhost...
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
+    r'(?::\d+)?'  # optional port
+    r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+
+# Map short service codes used in callback data to full service names
+_SERVICE_CODE_MAP = {
+    'bitly': 'bitly',
+    'tiny': 'tinyurl',
+    'cutt': 'cuttly',
+    'gpl': 'gplinks',
+    'all': 'all'
+}
+
+# Upper bound in seconds for any one service during an "All Services" fan-out
+_ALL_SERVICES_TIMEOUT = 30
+# Minimum gap in seconds between progress edits of the "All Services" reply
+_PROGRESS_EDIT_INTERVAL = 1.0
+
+# Startup connection warm-up is best effort and must not hold on to slow hosts
+_WARMUP_TIMEOUT = aiohttp.ClientTimeout(total=3)
+
+# Longest URL we accept; anything longer is rejected without running the regex
+_MAX_URL_LENGTH = 2048
+
+# Extracts the first link from a plain-text GPLinks response body (bytes)
+_HTTP_EXTRACT_PATTERN = re.compile(rb'https?://[^\s"]+', re.IGNORECASE)
+
+# Request headers for the GPLinks API
+_GPLINKS_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'application/json'
+}
+
+# Telegram bot tokens look like "<bot id>:<secret>"
+_BOT_TOKEN_PATTERN = re.compile(r'^\d+:[A-Za-z0-9_-]+$')
+
+def _parse_seconds(raw):
+    """Parse a duration in seconds, returning None for malformed or non-finite values"""
+    try:
+        seconds = float(raw)
+    except (TypeError, ValueError):
+        return None
+    return seconds if math.isfinite(seconds) else None
+
+def _parse_int(raw):
+    """Parse an integer setting, returning None for malformed values"""
+    try:
+        return int(raw)
+    except (TypeError, ValueError):
+        return None
+
 # Configuration from environment variables (for Render)
 class Config:
-    BOT_TOKEN = os.environ.get('BOT_TOKEN')
-    BITLY_TOKEN = os.environ.get('BITLY_TOKEN', '')
-    CUTTLY_API = os.environ.get('CUTTLY_API', '')
-    GPLINKS_API = os.environ.get('GPLINKS_API', '')
-    USE_WEBHOOK = os.environ.get('USE_WEBHOOK', 'true').lower() == 'true'
-    WEBHOOK_PORT = int(os.environ.get('PORT', 5000))
-    WEBHOOK_URL = os.environ.get('WEBHOOK_URL', '')
-    WELCOME_IMAGE_URL = os.environ.get('WELCOME_IMAGE_URL', 'https://iili.io/Kcbrql9.th.jpg')
-    
-    SUPPORTED_SERVICES = {
-        'bitly': {
-            'name': 'Bitly',
-            'api_url': 'https://api-ssl.bitly.com/v4/shorten',
-            'requires_key': True
-        },
-        'tinyurl': {
-            'name': 'TinyURL',
-            'api_url': 'http://tinyurl.com/api-create.php',
-            'requires_key': False
-        },
-        'cuttly': {
-            'name': 'Cuttly',
-            'api_url': 'https://cutt.ly/api/api.php',
-            'requires_key': True
-        },
-        'gplinks': {
-            'name': 'GPLinks',
-            'api_url': 'https://gplinks.in/api',
-            'requires_key': True
-        }
+    BOT_TOKEN = env('BOT_TOKEN')
+    USE_WEBHOOK = env('USE_WEBHOOK', 'true').lower() == 'true'
+    # Numeric settings are parsed leniently (None when malformed) and reported by validate()
+    WEBHOOK_PORT = _parse_int(env('PORT', '5000'))
+    WEBHOOK_URL = env('WEBHOOK_URL', '')
+    WELCOME_IMAGE_URL = env('WELCOME_IMAGE_URL', 'https://iili.io/Kcbrql9.th.jpg')
+    HTTP_TIMEOUT_TOTAL = _parse_seconds(env('HTTP_TIMEOUT_TOTAL', '8'))
+    
+    SUPPORTED_SERVICES = MappingProxyType({
+        key: Service(name, api_url, requires_key, env_var)
+        for key, name, api_url, requires_key, env_var in SERVICE_SPECS
+    })
+    
+    # Only read API keys for services that are listed and actually need one
+    API_KEYS = {
+        key: env(service.env_var, '')
+        for key, service in SUPPORTED_SERVICES.items()
+        if service.requires_key
     }
+    BITLY_TOKEN = API_KEYS.get('bitly', '')
+    CUTTLY_API = API_KEYS.get('cuttly', '')
+    GPLINKS_API = API_KEYS.get('gplinks', '')
+    
+    def validate(self) -> list:
+        """Check the configuration and return every problem found, not just the first"""
+        errors = []
+        if not self.BOT_TOKEN:
+            errors.append("BOT_TOKEN environment variable is not set")
+        elif not _BOT_TOKEN_PATTERN.match(self.BOT_TOKEN):
+            errors.append("BOT_TOKEN does not look like a Telegram bot token")
+        if self.USE_WEBHOOK and self.WEBHOOK_URL and not self.WEBHOOK_URL.startswith('https://'):
+            errors.append("WEBHOOK_URL must start with https://")
+        if self.HTTP_TIMEOUT_TOTAL is None or self.HTTP_TIMEOUT_TOTAL <= 0:
+            errors.append(f"HTTP_TIMEOUT_TOTAL must be a positive number of seconds, "
+                          f"got {env('HTTP_TIMEOUT_TOTAL')!r}")
+        if self.WEBHOOK_PORT is None or not 0 < self.WEBHOOK_PORT < 65536:
+            errors.append(f"PORT must be a number between 1 and 65535, got {env('PORT')!r}")
+        return errors
 
 config = Config()
 
+# TinyURL is consistently fast, so it gets a tighter budget, never looser than HTTP_TIMEOUT_TOTAL
+_TINYURL_TIMEOUT = aiohttp.ClientTimeout(total=min(4, config.HTTP_TIMEOUT_TOTAL or 4))
+
+# Services that can be used right now: keyless ones plus those with an API key set
+_CONFIGURED_SERVICES = frozenset(
+    service_key
+    for service_key, service_info in config.SUPPORTED_SERVICES.items()
+    if not service_info.requires_key or config.API_KEYS.get(service_key)
+)
+
+# Reply texts shared by every handler
+_ERR_GENERIC = "❌ An error occurred. Please try again."
+_ERR_INVALID_URL = "❌ Please provide a valid URL starting with http:// or https://"
+
+# Static /start and /help texts; only the mention in the /start greeting varies per user
+_WELCOME_TEMPLATE = """
+👋 Hello {mention}!
+
+**Welcome to URL Shortener Bot!** 🌐
+
+I can shorten your long URLs using various services and help you earn money with shortened links!
+
+✨ **Features:**
+• Multiple URL shortening services
+• Easy-to-use interface
+• Monetization options with GPLinks
+• Fast and reliable service
+
+📋 **Available Commands:**
+/start - Start the bot
+/help - Show help message  
+/shorten - Shorten a URL
+/status - Check API key status
+
+🚀 **Get Started:**
+Simply send me a URL or use /shorten command to begin!
+"""
+
+_HELP_TEXT = """
+🤖 **URL Shortener Bot Help Guide**
+
+📖 **How to use:**
+1. Send me any long URL directly
+2. Or use `/shorten <URL>` command
+3. Choose your preferred shortening service
+4. Get your shortened link instantly!
+
+🔗 **Example:**
+`/shorten https://www.example.com/very-long-url-path`
+
+🛠 **Supported Services:**
+✅ **Bitly** - Professional URL shortening with analytics
+✅ **TinyURL** - Simple, reliable, no API key required  
+✅ **Cuttly** - Advanced analytics and customization
+✅ **GPLinks** - Earn money from your shortened links!
+
+💰 **Monetization:**
+With GPLinks, you can earn revenue from every click!
+Sign up at https://gplinks.in for your API key.
+
+🔧 **Need Help?**
+Use `/status` to check your API key configuration.
+"""
+
+def _render_status_text() -> str:
+    """Build the /status reply from the API keys loaded at startup"""
+    parts = ["🔧 **API Key Status**\n\n"]
+    for service_key, service_info in config.SUPPORTED_SERVICES.items():
+        if service_info.requires_key:
+            api_key = config.API_KEYS.get(service_key, '')
+            has_key = bool(api_key)
+            key_preview = api_key[:8] + '...' if has_key else 'Not set'
+        else:
+            has_key = True
+            key_preview = "Not required"
+        
+        status_icon = "✅" if has_key else "❌"
+        parts.append(f"**{service_info.name}**: {status_icon} ({key_preview})\n")
+    return "".join(parts)
+
+# API keys never change at runtime, so the /status reply is rendered once
+_STATUS_TEXT = _render_status_text()
+
+def _shorten_failed_message(service: str, service_info) -> str:
+    """Build the reply shown when a single service fails to shorten a URL"""
+    service_name = service_info.name if service_info else service.capitalize()
+    error_msg = f"❌ Failed to shorten URL using {service_name}."
+    
+    if service == 'gplinks':
+        if not config.GPLINKS_API:
+            error_msg += "\n🔑 GPLinks API key not configured."
+        else:
+            error_msg += "\n🔧 Service might be unavailable."
+    elif service_info is None or service_info.requires_key:
+        error_msg += " API key might not be configured."
+    else:
+        error_msg += " Service might be temporarily unavailable."
+    return error_msg
+
+# Configuration is fixed at startup, so failure replies can be rendered once
+_SHORTEN_FAILED_MESSAGES = {
+    service_key: _shorten_failed_message(service_key, service_info)
+    for service_key, service_info in config.SUPPORTED_SERVICES.items()
+}
+
+class TTLCache:
+    """Size-bounded LRU mapping whose entries expire after a fixed time-to-live"""
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (value, expires_at)
+    
+    def __len__(self):
+        return len(self._data)
+    
+    def __setitem__(self, key, value):
+        self._data[key] = (value, time.monotonic() + self.ttl)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+    
+    def get(self, key, default=None):
+        """Return a live entry and mark it as recently used"""
+        item = self._data.get(key)
+        if item is None:
+            return default
+        value, expires_at = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+class CircuitBreaker:
+    """Stops calling a service for a cooldown period after consecutive failures"""
+    
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.open_until = 0.0  # 0 while closed; set when the breaker trips
+        self.trial_running = False
+    
+    def allow(self) -> bool:
+        """Return True when the service may be called; after a cooldown only one trial call gets through"""
+        if not self.open_until:
+            return True
+        if self.trial_running or time.monotonic() < self.open_until:
+            return False
+        self.trial_running = True
+        return True
+    
+    def record_success(self):
+        self.failures = 0
+        self.open_until = 0.0
+        self.trial_running = False
+    
+    def record_failure(self):
+        self.failures += 1
+        # A failed trial re-opens the breaker straight away
+        if self.trial_running or self.failures >= self.threshold:
+            self.open_until = time.monotonic() + self.cooldown
+            self.failures = 0
+            self.trial_running = False
+    
+    def end_trial(self):
+        """Let another trial through when the trial call ended without a success or failure"""
+        self.trial_running = False
+
 class URLShortenerBot:
     def __init__(self, token):
         self.token = token
-        self.application = Application.builder().token(token).build()
-        self.url_cache = {}  # Cache for URL storage
+        self.application = (
+            Application.builder()
+            .token(token)
+            # Keep outgoing sends under Telegram's flood limits and retry after 429s
+            .rate_limiter(AIORateLimiter(max_retries=3))
+            # Handle updates concurrently so one user's upstream call doesn't block the rest
+            .concurrent_updates(256)
+            # One Bot API connection per in-flight handler, waiting up to 10s for a free one
+            .connection_pool_size(256)
+            .pool_timeout(10)
+            .post_init(self.post_init)
+            .post_shutdown(self.post_shutdown)
+            .build()
+        )
+        self.http = None  # aiohttp session, opened in post_init on the bot's event loop
+        self.warmup_task = None  # background connection warm-up started in post_init
+        self.url_cache = TTLCache(maxsize=10000, ttl=3600)  # Cache for URL storage
+        self.short_url_cache = TTLCache(maxsize=4096, ttl=86400)  # (service, url) -> shortened URL
+        self.image_check_cache = TTLCache(maxsize=4, ttl=600)  # image URL -> accessible
+        
+        self.gplinks_method = 'GET'  # GPLinks HTTP method that last succeeded
+        self.bitly_headers = {
+            'Authorization': f'Bearer {config.BITLY_TOKEN}',
+            'Content-Type': 'application/json'
+        }
+        self.breakers = {
+            service_key: CircuitBreaker(threshold=3, cooldown=60)
+            for service_key in config.SUPPORTED_SERVICES
+        }
+        
+        # Service dispatch table, built once instead of walking an if/elif chain per call
+        self.shorteners = {
+            'bitly': self._shorten_bitly,
+            'tinyurl': self._shorten_tinyurl,
+            'cuttly': self._shorten_cuttly,
+            'gplinks': self._shorten_gplinks,
+        }
         
         # Add handlers
         self.application.add_handler(CommandHandler("start", self.start))
@@ -66,20 +364,55 @@ class URLShortenerBot:
         # Add error handler
         self.application.add_error_handler(self.error_handler)
     
+    async def post_init(self, application: Application):
+        """Open the shared aiohttp session once the event loop is running"""
+        self.http = aiohttp.ClientSession(
+            # Fail fast on stuck DNS/TCP instead of holding a handler for the whole budget
+            timeout=aiohttp.ClientTimeout(
+                total=config.HTTP_TIMEOUT_TOTAL,
+                connect=2,
+                sock_connect=2,
+                sock_read=6
+            ),
+            connector=aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=20,
+                ttl_dns_cache=300,
+                keepalive_timeout=75,
+                enable_cleanup_closed=True
+            )
+        )
+        # Resolve and connect to the shortener hosts in the background so the first user skips the handshake
+        self.warmup_task = asyncio.create_task(self.warm_up_connections())
+        
+        # Check welcome image accessibility
+        if config.WELCOME_IMAGE_URL:
+            if await self.is_image_accessible(config.WELCOME_IMAGE_URL):
+                logger.info("Welcome image is accessible: %s", config.WELCOME_IMAGE_URL)
+            else:
+                logger.warning("Welcome image not accessible, will use text only: %s", config.WELCOME_IMAGE_URL)
+    
+    async def post_shutdown(self, application: Application):
+        """Close the shared aiohttp session on shutdown"""
+        if self.warmup_task is not None:
+            # Let the cancelled warm-up unwind before its session goes away
+            self.warmup_task.cancel()
+            await asyncio.gather(self.warmup_task, return_exceptions=True)
+        if self.http is not None:
+            await self.http.close()
+    
     def is_valid_url(self, url: str) -> bool:
         """Enhanced URL validation"""
-        pattern = re.compile(
-            r'^https?://'  # http:// or https://
-            r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
-            r'localhost|'  # localhost...
-            r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
-            r'(?::\d+)?'  # optional port
-            r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-        return re.match(pattern, url) is not None
+        # Cheap length and scheme checks reject most non-URLs before the regex runs
+        if not url or len(url) > _MAX_URL_LENGTH or not url[:8].lower().startswith(('http://', 'https://')):
+            return False
+        return _URL_PATTERN.match(url) is not None
     
     def generate_url_id(self, url: str) -> str:
         """Generate a short unique ID for the URL to avoid long callback data"""
-        url_hash = hashlib.md5(url.encode()).hexdigest()[:8]
+        # BLAKE2b emits exactly the 6 bytes (12 hex chars) we need, no truncation;
+        # 48 bits keeps accidental collisions negligible for a 10k-entry cache
+        url_hash = hashlib.blake2b(url.encode('utf-8', 'surrogatepass'), digest_size=6).hexdigest()
         return url_hash
     
     def store_url(self, url: str) -> str:
@@ -94,155 +427,192 @@ class URLShortenerBot:
     
     async def error_handler(self, update: Update, context: CallbackContext):
         """Handle errors in the telegram bot"""
-        logger.error(f"Exception while handling an update: {context.error}", exc_info=context.error)
+        logger.error("Exception while handling an update: %s", context.error, exc_info=context.error)
         
         try:
             if update and update.effective_message:
-                await update.effective_message.reply_text("❌ An error occurred. Please try again.")
+                await update.effective_message.reply_text(_ERR_GENERIC)
         except Exception as e:
-            logger.error(f"Error while sending error message: {e}")
+            logger.error("Error while sending error message: %s", e)
 
-    def is_image_accessible(self, url: str) -> bool:
-        """Check if the welcome image URL is accessible"""
+    async def warm_up_connections(self):
+        """Open pooled connections to the configured shortener APIs ahead of the first request"""
+        async def probe(service_key):
+            api_url = config.SUPPORTED_SERVICES[service_key].api_url
+            try:
+                async with self.http.head(api_url, timeout=_WARMUP_TIMEOUT):
+                    pass
+            except Exception as e:
+                logger.debug("Connection warm-up for %s failed: %s", service_key, e)
+        
+        await asyncio.gather(*(probe(service_key) for service_key in _CONFIGURED_SERVICES))
+    
+    async def is_image_accessible(self, url: str) -> bool:
+        """Check if the welcome image URL is accessible, reusing recent results"""
+        accessible = self.image_check_cache.get(url)
+        if accessible is not None:
+            return accessible
+        
         try:
-            response = requests.head(url, timeout=10)
-            return response.status_code == 200
-        except:
-            return False
+            async with self.http.head(url) as response:
+                accessible = response.status == 200
+        except Exception:
+            accessible = False
+        self.image_check_cache[url] = accessible
+        return accessible
 
-    def shorten_url(self, url, service):
-        """Shorten URL using the specified service"""
+    async def _request_short_url(self, service, method, parse, **request_args):
+        """Send one shortener API request and parse the short link from a 200 response; 429/5xx raise"""
+        service_info = config.SUPPORTED_SERVICES[service]
+        async with self.http.request(method, service_info.api_url, **request_args) as response:
+            if response.status != 200:
+                logger.error("%s API %s failed. Status: %s - %s",
+                             service_info.name, method, response.status, await response.text())
+                # Overload and server errors mean the service is unhealthy; let the circuit breaker count them
+                if response.status >= 500 or response.status == 429:
+                    response.raise_for_status()
+                return None
+            return parse(await response.read())
+    
+    def _parse_bitly_response(self, body: bytes):
+        """Extract the short link from a Bitly response body"""
+        return orjson.loads(body)['link']
+    
+    def _parse_tinyurl_response(self, body: bytes):
+        """Extract the short link from a TinyURL response body"""
+        return body.decode().strip()
+    
+    def _parse_cuttly_response(self, body: bytes):
+        """Extract the short link from a Cuttly response body"""
+        data = orjson.loads(body)
+        if data.get('url', {}).get('status') == 7:
+            return data['url']['shortLink']
+        logger.error("Cuttly API error: %s", data)
+        return None
+    
+    def _parse_gplinks_response(self, body: bytes):
+        """Extract the short link from a raw GPLinks response body"""
+        body = body.strip()
+        # Plain-text link: the common case, decoded without any JSON parsing
+        if body[:8].lower().startswith((b'http://', b'https://')):
+            return body.decode()
+        
         try:
-            # Validate URL first
-            if not self.is_valid_url(url):
+            json_data = orjson.loads(body)
+        except ValueError:
+            json_data = None
+        if isinstance(json_data, dict):
+            if json_data.get('status') == 'success':
+                return json_data.get('shortenedUrl') or json_data.get('shorturl')
+            elif 'shortenedUrl' in json_data:
+                return json_data['shortenedUrl']
+            return None
+        
+        # Neither a link nor a JSON object: pull the first link out of the text
+        match = _HTTP_EXTRACT_PATTERN.search(body)
+        if match:
+            return match.group().decode()
+        return None
+    
+    async def _shorten_bitly(self, url):
+        """Shorten URL using Bitly"""
+        if not config.BITLY_TOKEN:
+            logger.error("Bitly token not configured")
+            return None
+        
+        return await self._request_short_url(
+            'bitly', 'POST', self._parse_bitly_response,
+            headers=self.bitly_headers,
+            data=orjson.dumps({'long_url': url})
+        )
+    
+    async def _shorten_tinyurl(self, url):
+        """Shorten URL using TinyURL"""
+        return await self._request_short_url(
+            'tinyurl', 'GET', self._parse_tinyurl_response,
+            params={'url': url},
+            timeout=_TINYURL_TIMEOUT
+        )
+    
+    async def _shorten_cuttly(self, url):
+        """Shorten URL using Cuttly"""
+        if not config.CUTTLY_API:
+            logger.error("Cuttly API key not configured")
+            return None
+        
+        return await self._request_short_url(
+            'cuttly', 'GET', self._parse_cuttly_response,
+            params={'key': config.CUTTLY_API, 'short': url}
+        )
+    
+    async def _shorten_gplinks(self, url):
+        """Shorten URL using GPLinks"""
+        if not config.GPLINKS_API:
+            logger.error("GPLinks API key not configured")
+            return None
+        
+        params = {'api': config.GPLINKS_API, 'url': url}
+        
+        # Try the method that worked last time first, and only fall back to the other on failure
+        methods = ('GET', 'POST') if self.gplinks_method == 'GET' else ('POST', 'GET')
+        for method in methods:
+            request_args = {'params': params} if method == 'GET' else {'data': params}
+            shortened_url = await self._request_short_url(
+                'gplinks', method, self._parse_gplinks_response,
+                headers=_GPLINKS_HEADERS,
+                **request_args
+            )
+            if shortened_url:
+                self.gplinks_method = method
+                return shortened_url
+        
+        logger.error("GPLinks API failed with both GET and POST")
+        return None
+
+    async def shorten_url(self, url, service):
+        """Shorten a URL already checked by is_valid_url using the specified service"""
+        try:
+            shortener = self.shorteners.get(service)
+            if shortener is None:
                 return None
 
-            logger.info(f"Shortening URL with {service}: {url}")
+            # Identical URLs only hit the upstream API once per day
+            cache_key = (service, url)
+            cached_url = self.short_url_cache.get(cache_key)
+            if cached_url is not None:
+                return cached_url
 
-            if service == 'bitly':
-                if not config.BITLY_TOKEN:
-                    logger.error("Bitly token not configured")
-                    return None
-                
-                headers = {
-                    'Authorization': f'Bearer {config.BITLY_TOKEN}',
-                    'Content-Type': 'application/json'
-                }
-                data = {'long_url': url}
-                response = requests.post(
-                    config.SUPPORTED_SERVICES[service]['api_url'], 
-                    headers=headers, 
-                    json=data, 
-                    timeout=10
-                )
-                if response.status_code == 200:
-                    return response.json()['link']
-                else:
-                    logger.error(f"Bitly API error: {response.status_code} - {response.text}")
-                    return None
-            
-            elif service == 'tinyurl':
-                params = {'url': url}
-                response = requests.get(
-                    config.SUPPORTED_SERVICES[service]['api_url'], 
-                    params=params, 
-                    timeout=10
-                )
-                if response.status_code == 200:
-                    return response.text.strip()
-                else:
-                    logger.error(f"TinyURL API error: {response.status_code}")
-                    return None
-            
-            elif service == 'cuttly':
-                if not config.CUTTLY_API:
-                    logger.error("Cuttly API key not configured")
-                    return None
-                
-                params = {'key': config.CUTTLY_API, 'short': url}
-                response = requests.get(
-                    config.SUPPORTED_SERVICES[service]['api_url'], 
-                    params=params, 
-                    timeout=10
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get('url', {}).get('status') == 7:
-                        return data['url']['shortLink']
-                    else:
-                        logger.error(f"Cuttly API error: {data}")
-                        return None
-                else:
-                    logger.error(f"Cuttly HTTP error: {response.status_code}")
-                    return None
-            
-            elif service == 'gplinks':
-                if not config.GPLINKS_API:
-                    logger.error("GPLinks API key not configured")
-                    return None
-                
-                api_url = "https://gplinks.in/api"
-                params = {'api': config.GPLINKS_API, 'url': url}
-                
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                    'Accept': 'application/json'
-                }
-                
-                # Try GET request first
-                response = requests.get(api_url, params=params, headers=headers, timeout=15)
-                
-                if response.status_code == 200:
-                    response_text = response.text.strip()
-                    
-                    if response_text.startswith('http'):
-                        return response_text
-                    
-                    try:
-                        json_data = response.json()
-                        if json_data.get('status') == 'success':
-                            return json_data.get('shortenedUrl') or json_data.get('shorturl')
-                        elif 'shortenedUrl' in json_data:
-                            return json_data['shortenedUrl']
-                    except ValueError:
-                        if 'http' in response_text:
-                            urls = re.findall(r'https?://[^\s]+', response_text)
-                            if urls:
-                                return urls[0]
-                
-                # If GET failed, try POST request
-                payload = {'api': config.GPLINKS_API, 'url': url}
-                response = requests.post(api_url, data=payload, headers=headers, timeout=15)
-                
-                if response.status_code == 200:
-                    response_text = response.text.strip()
-                    
-                    if response_text.startswith('http'):
-                        return response_text
-                    
-                    try:
-                        json_data = response.json()
-                        if json_data.get('status') == 'success':
-                            return json_data.get('shortenedUrl') or json_data.get('shorturl')
-                    except ValueError:
-                        if 'http' in response_text:
-                            urls = re.findall(r'https?://[^\s]+', response_text)
-                            if urls:
-                                return urls[0]
-                
-                logger.error(f"GPLinks API failed. Status: {response.status_code}")
+            # Skip services that keep timing out or refusing connections for a cooldown period
+            breaker = self.breakers[service]
+            if not breaker.allow():
+                logger.warning("Skipping %s: circuit open after repeated failures", service)
                 return None
+
+            trial = breaker.trial_running
+
+            logger.info("Shortening URL with %s: %s", service, url)
+            try:
+                shortened_url = await shortener(url)
+            except (asyncio.TimeoutError, aiohttp.ClientError):
+                breaker.record_failure()
+                raise
+            finally:
+                if trial:
+                    breaker.end_trial()
+            # Only a returned link proves the service works; 4xx rejections and missing keys say nothing
+            if shortened_url:
+                breaker.record_success()
+                self.short_url_cache[cache_key] = shortened_url
+            return shortened_url
             
+        except asyncio.TimeoutError:
+            logger.error("Timeout while shortening URL with %s", service)
             return None
-            
-        except requests.exceptions.Timeout:
-            logger.error(f"Timeout while shortening URL with {service}")
-            return None
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Request error with {service}: {e}")
+        except aiohttp.ClientError as e:
+            logger.error("Request error with %s: %s", service, e)
             return None
         except Exception as e:
-            logger.error(f"Error shortening URL with {service}: {str(e)}")
+            logger.error("Error shortening URL with %s: %s", service, e)
             return None
     
     async def start(self, update: Update, context: CallbackContext):
@@ -250,32 +620,11 @@ class URLShortenerBot:
         try:
             user = update.effective_user
             
-            welcome_text = f"""
-👋 Hello {user.mention_html()}!
-
-**Welcome to URL Shortener Bot!** 🌐
-
-I can shorten your long URLs using various services and help you earn money with shortened links!
-
-✨ **Features:**
-• Multiple URL shortening services
-• Easy-to-use interface
-• Monetization options with GPLinks
-• Fast and reliable service
-
-📋 **Available Commands:**
-/start - Start the bot
-/help - Show help message  
-/shorten - Shorten a URL
-/status - Check API key status
-
-🚀 **Get Started:**
-Simply send me a URL or use /shorten command to begin!
-            """
+            welcome_text = _WELCOME_TEMPLATE.format(mention=user.mention_html())
             
             # Try to send with image if available and accessible
             image_sent = False
-            if config.WELCOME_IMAGE_URL and self.is_image_accessible(config.WELCOME_IMAGE_URL):
+            if config.WELCOME_IMAGE_URL and await self.is_image_accessible(config.WELCOME_IMAGE_URL):
                 try:
                     await update.message.reply_photo(
                         photo=config.WELCOME_IMAGE_URL,
@@ -285,7 +634,7 @@ Simply send me a URL or use /shorten command to begin!
                     image_sent = True
                     logger.info("Welcome image sent successfully")
                 except Exception as photo_error:
-                    logger.warning(f"Could not send welcome image: {photo_error}")
+                    logger.warning("Could not send welcome image: %s", photo_error)
                     image_sent = False
             
             # If image failed or not available, send text only
@@ -294,74 +643,23 @@ Simply send me a URL or use /shorten command to begin!
                 logger.info("Welcome message sent as text (image not available)")
                 
         except Exception as e:
-            logger.error(f"Error in start command: {e}")
-            await update.message.reply_text("❌ An error occurred. Please try again.")
+            logger.error("Error in start command: %s", e)
+            await update.message.reply_text(_ERR_GENERIC)
     
     async def help(self, update: Update, context: CallbackContext):
         """Send help message"""
         try:
-            help_text = """
-🤖 **URL Shortener Bot Help Guide**
-
-📖 **How to use:**
-1. Send me any long URL directly
-2. Or use `/shorten <URL>` command
-3. Choose your preferred shortening service
-4. Get your shortened link instantly!
-
-🔗 **Example:**
-`/shorten https://www.example.com/very-long-url-path`
-
-🛠 **Supported Services:**
-✅ **Bitly** - Professional URL shortening with analytics
-✅ **TinyURL** - Simple, reliable, no API key required  
-✅ **Cuttly** - Advanced analytics and customization
-✅ **GPLinks** - Earn money from your shortened links!
-
-💰 **Monetization:**
-With GPLinks, you can earn revenue from every click!
-Sign up at https://gplinks.in for your API key.
-
-🔧 **Need Help?**
-Use `/status` to check your API key configuration.
-            """
-            await update.message.reply_text(help_text, parse_mode='Markdown')
+            await update.message.reply_text(_HELP_TEXT, parse_mode='Markdown')
         except Exception as e:
-            logger.error(f"Error in help command: {e}")
-            await update.message.reply_text("❌ An error occurred. Please try again.")
+            logger.error("Error in help command: %s", e)
+            await update.message.reply_text(_ERR_GENERIC)
     
     async def status(self, update: Update, context: CallbackContext):
         """Check API key status"""
         try:
-            status_text = "🔧 **API Key Status**\n\n"
-            
-            for service_key, service_info in config.SUPPORTED_SERVICES.items():
-                service_name = service_info['name']
-                requires_key = service_info['requires_key']
-                
-                if service_key == 'bitly':
-                    has_key = bool(config.BITLY_TOKEN)
-                    key_preview = config.BITLY_TOKEN[:8] + '...' if has_key else 'Not set'
-                elif service_key == 'cuttly':
-                    has_key = bool(config.CUTTLY_API)
-                    key_preview = config.CUTTLY_API[:8] + '...' if has_key else 'Not set'
-                elif service_key == 'gplinks':
-                    has_key = bool(config.GPLINKS_API)
-                    key_preview = config.GPLINKS_API[:8] + '...' if has_key else 'Not set'
-                else:
-                    has_key = True
-                    key_preview = "Not required"
-                
-                status_text += f"**{service_name}**: "
-                if requires_key:
-                    status_text += "✅" if has_key else "❌"
-                else:
-                    status_text += "✅"
-                status_text += f" ({key_preview})\n"
-            
-            await update.message.reply_text(status_text, parse_mode='Markdown')
+            await update.message.reply_text(_STATUS_TEXT, parse_mode='Markdown')
         except Exception as e:
-            logger.error(f"Error in status command: {e}")
+            logger.error("Error in status command: %s", e)
             await update.message.reply_text("❌ Error checking status")
     
     async def shorten(self, update: Update, context: CallbackContext):
@@ -374,29 +672,25 @@ Use `/status` to check your API key configuration.
             url = ' '.join(context.args)
             await self.process_url(update, url)
         except Exception as e:
-            logger.error(f"Error in shorten command: {e}")
-            await update.message.reply_text("❌ An error occurred. Please try again.")
+            logger.error("Error in shorten command: %s", e)
+            await update.message.reply_text(_ERR_GENERIC)
     
     async def handle_message(self, update: Update, context: CallbackContext):
         """Handle messages containing URLs"""
         try:
+            # process_url validates the text (scheme pre-check first, then the regex)
             url = update.message.text.strip()
-            
-            if not (url.startswith('http://') or url.startswith('https://')):
-                await update.message.reply_text("Please send a valid URL starting with http:// or https://")
-                return
-            
             await self.process_url(update, url)
         except Exception as e:
-            logger.error(f"Error handling message: {e}")
-            await update.message.reply_text("❌ An error occurred. Please try again.")
+            logger.error("Error handling message: %s", e)
+            await update.message.reply_text(_ERR_GENERIC)
     
     async def process_url(self, update: Update, url: str):
         """Process URL and generate shortened versions"""
         try:
             # Validate URL
             if not self.is_valid_url(url):
-                await update.message.reply_text("❌ Please provide a valid URL starting with http:// or https://")
+                await update.message.reply_text(_ERR_INVALID_URL)
                 return
             
             # Show typing action
@@ -431,7 +725,7 @@ Use `/status` to check your API key configuration.
                 parse_mode='Markdown'
             )
         except Exception as e:
-            logger.error(f"Error processing URL: {e}")
+            logger.error("Error processing URL: %s", e)
             await update.message.reply_text("❌ An error occurred while processing your URL. Please try again.")
     
     async def button_handler(self, update: Update, context: CallbackContext):
@@ -441,27 +735,20 @@ Use `/status` to check your API key configuration.
             await query.answer()
             
             data = query.data
-            logger.info(f"Callback data received: {data}")
+            logger.info("Callback data received: %s", data)
             
             if data.startswith('s_'):
-                parts = data.split('_', 2)
-                if len(parts) == 3:
-                    _, service_code, url_id = parts
+                # Callback data is 's_<service code>_<url id>'; slice it without building a list
+                svc_end = data.find('_', 2)
+                if svc_end != -1:
+                    service_code = data[2:svc_end]
+                    url_id = data[svc_end + 1:]
                     
-                    # Map short service codes to full service names
-                    service_map = {
-                        'bitly': 'bitly',
-                        'tiny': 'tinyurl', 
-                        'cutt': 'cuttly',
-                        'gpl': 'gplinks',
-                        'all': 'all'
-                    }
-                    
-                    service = service_map.get(service_code, service_code)
+                    service = _SERVICE_CODE_MAP.get(service_code, service_code)
                     url = self.get_url(url_id)
                     
                     if not url:
-                        await query.edit_message_text("❌ URL not found. Please try again.")
+                        await query.edit_message_text("⌛ This link has expired. Please send the URL again.")
                         return
                     
                     # Show typing action
@@ -477,19 +764,19 @@ Use `/status` to check your API key configuration.
                 await query.edit_message_text("❌ Unknown command. Please try again.")
                 
         except Exception as e:
-            logger.error(f"Error in button handler: {e}")
+            logger.error("Error in button handler: %s", e)
             try:
-                await query.edit_message_text("❌ An error occurred. Please try again.")
+                await query.edit_message_text(_ERR_GENERIC)
             except:
-                await query.message.reply_text("❌ An error occurred. Please try again.")
+                await query.message.reply_text(_ERR_GENERIC)
     
     async def send_single_shortened_url(self, query, url: str, service: str):
         """Send shortened URL from a single service"""
         try:
-            service_info = config.SUPPORTED_SERVICES.get(service, {})
-            service_name = service_info.get('name', service.capitalize())
+            service_info = config.SUPPORTED_SERVICES.get(service)
+            service_name = service_info.name if service_info else service.capitalize()
             
-            shortened_url = self.shorten_url(url, service)
+            shortened_url = await self.shorten_url(url, service)
             
             if shortened_url:
                 message = f"✅ **{service_name}**\n🔗 `{shortened_url}`"
@@ -503,79 +790,121 @@ Use `/status` to check your API key configuration.
                     parse_mode='Markdown'
                 )
             else:
-                error_msg = f"❌ Failed to shorten URL using {service_name}."
-                
-                if service == 'gplinks':
-                    if not config.GPLINKS_API:
-                        error_msg += "\n🔑 GPLinks API key not configured."
-                    else:
-                        error_msg += "\n🔧 Service might be unavailable."
-                elif service_info.get('requires_key', True):
-                    error_msg += " API key might not be configured."
-                else:
-                    error_msg += " Service might be temporarily unavailable."
-                
+                error_msg = _SHORTEN_FAILED_MESSAGES.get(service) or _shorten_failed_message(service, service_info)
                 await query.edit_message_text(text=error_msg)
         except Exception as e:
-            logger.error(f"Error sending single shortened URL: {e}")
+            logger.error("Error sending single shortened URL: %s", e)
             await query.edit_message_text("❌ Error generating shortened URL. Please try again.")
     
+    async def _shorten_for_all(self, url: str, service_key: str):
+        """Shorten with one service for the All Services reply, reporting failures as None"""
+        try:
+            shortened_url = await asyncio.wait_for(
+                self.shorten_url(url, service_key),
+                timeout=_ALL_SERVICES_TIMEOUT
+            )
+        except Exception as e:
+            logger.error("%s failed during All Services: %r", service_key, e)
+            shortened_url = None
+        return service_key, shortened_url
+    
+    def _render_all_results(self, results: dict, done: bool) -> str:
+        """Build the All Services reply from the results received so far"""
+        parts = ["🔗 **Shortened URLs**\n\n"]
+        successful_shortens = 0
+        
+        for service_key, service_info in config.SUPPORTED_SERVICES.items():
+            service_name = service_info.name
+            if service_key not in _CONFIGURED_SERVICES:
+                parts.append(f"❌ **{service_name}** - Not configured\n\n")
+            elif service_key not in results:
+                parts.append(f"⏳ **{service_name}** - Working...\n\n")
+            elif results[service_key]:
+                earn_icon = " 💰" if service_key == 'gplinks' else ""
+                parts.append(f"✅ **{service_name}**\n`{results[service_key]}`{earn_icon}\n\n")
+                successful_shortens += 1
+            else:
+                parts.append(f"❌ **{service_name}** - Failed\n\n")
+        
+        if done:
+            if successful_shortens == 0:
+                return "❌ All services failed. Please try again later."
+            parts.append(f"✅ **{successful_shortens}/{len(config.SUPPORTED_SERVICES)} successful**")
+        return "".join(parts)
+    
     async def send_all_shortened_urls(self, query, url: str):
         """Send shortened URLs from all available services"""
+        pending = set()
         try:
-            message = "🔗 **Shortened URLs**\n\n"
-            successful_shortens = 0
+            results = {}
             
-            for service_key, service_info in config.SUPPORTED_SERVICES.items():
-                service_name = service_info.get('name', service_key.capitalize())
-                shortened_url = self.shorten_url(url, service_key)
-                
-                if shortened_url:
-                    message += f"✅ **{service_name}**\n`{shortened_url}`"
-                    if service_key == 'gplinks':
-                        message += " 💰"
-                    message += "\n\n"
-                    successful_shortens += 1
-                else:
-                    message += f"❌ **{service_name}** - Failed\n\n"
+            # Start every configured service first so the placeholder edit below overlaps their round trips
+            pending = {
+                asyncio.create_task(self._shorten_for_all(url, service_key))
+                for service_key in config.SUPPORTED_SERVICES
+                if service_key in _CONFIGURED_SERVICES
+            }
             
-            if successful_shortens == 0:
-                message = "❌ All services failed. Please try again later."
-            else:
-                message += f"✅ **{successful_shortens}/{len(config.SUPPORTED_SERVICES)} successful**"
+            # Show every service as pending right away, then fill rows in as services answer
+            try:
+                await query.edit_message_text(
+                    text=self._render_all_results(results, done=False),
+                    disable_web_page_preview=True,
+                    parse_mode='Markdown'
+                )
+            except Exception as e:
+                logger.warning("Could not show All Services placeholder: %s", e)
+            last_edit = time.monotonic()
+            shown = 0
             
-            await query.edit_message_text(
-                text=message,
-                disable_web_page_preview=True,
-                parse_mode='Markdown'
-            )
+            # Fold results into the reply as they arrive
+            while pending:
+                # With unshown results, wait only until the next edit is allowed
+                timeout = None if len(results) == shown else max(0, last_edit + _PROGRESS_EDIT_INTERVAL - time.monotonic())
+                finished, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    service_key, shortened_url = task.result()
+                    results[service_key] = shortened_url
+                
+                # Coalesce results that land together into one edit, at most one progress edit per interval
+                if pending and time.monotonic() - last_edit < _PROGRESS_EDIT_INTERVAL:
+                    continue
+                # A failed progress edit must not throw away the links the other services return
+                try:
+                    await query.edit_message_text(
+                        text=self._render_all_results(results, done=not pending),
+                        disable_web_page_preview=True,
+                        parse_mode='Markdown'
+                    )
+                except Exception as e:
+                    logger.warning("Could not update All Services reply: %s", e)
+                last_edit = time.monotonic()
+                shown = len(results)
         except Exception as e:
-            logger.error(f"Error sending all shortened URLs: {e}")
+            logger.error("Error sending all shortened URLs: %s", e)
             await query.edit_message_text("❌ Error generating shortened URLs. Please try again.")
+        finally:
+            # Don't leave service calls running for a reply that is no longer being built
+            for task in pending:
+                task.cancel()
     
     def run_webhook(self):
         """Start the bot with webhook (Render-compatible)"""
         try:
-            logger.info(f"Starting URL Shortener Bot with webhook on port {config.WEBHOOK_PORT}...")
+            logger.info("Starting URL Shortener Bot with webhook on port %s...", config.WEBHOOK_PORT)
             
-            # Set webhook explicitly first
             if config.WEBHOOK_URL:
                 webhook_url = f"{config.WEBHOOK_URL}/{self.token}"
-                logger.info(f"Setting webhook to: {webhook_url}")
-                
-                # Set the webhook
-                self.application.bot.set_webhook(
-                    url=webhook_url,
-                    allowed_updates=Update.ALL_TYPES,
-                    drop_pending_updates=True
-                )
+                logger.info("Setting webhook to: %s", webhook_url)
                 
-                # Run the webhook server
+                # run_webhook registers the webhook itself, so no separate set_webhook call
                 self.application.run_webhook(
                     listen="0.0.0.0",
                     port=config.WEBHOOK_PORT,
                     webhook_url=webhook_url,
-                    url_path=self.token
+                    url_path=self.token,
+                    allowed_updates=[Update.MESSAGE, Update.CALLBACK_QUERY],
+                    drop_pending_updates=True
                 )
             else:
                 # Fallback for Render without explicit WEBHOOK_URL
@@ -588,19 +917,29 @@ Use `/status` to check your API key configuration.
                 )
                 
         except Exception as e:
-            logger.error(f"Error starting webhook: {e}")
+            logger.error("Error starting webhook: %s", e)
             raise
 
     def run_polling(self):
         """Alternative polling method for development"""
         logger.info("Starting bot with polling...")
-        self.application.run_polling()
+        # Long-poll and only ask Telegram for the update types we have handlers for;
+        # keep updates queued while the bot was down so they are answered on restart
+        self.application.run_polling(
+            poll_interval=0.0,
+            timeout=30,
+            allowed_updates=[Update.MESSAGE, Update.CALLBACK_QUERY],
+            drop_pending_updates=False
+        )
 
 def main():
     """Main function to run the bot"""
     try:
-        if not config.BOT_TOKEN:
-            print("❌ Error: Please set BOT_TOKEN environment variable")
+        errors = config.validate()
+        if errors:
+            print("❌ Error: Invalid configuration:")
+            for error in errors:
+                print(f"   • {error}")
             return
         
         print("🤖 URL Shortener Bot Starting...")
@@ -612,25 +951,13 @@ def main():
         else:
             print("🔄 Polling Mode: Enabled")
         
-        print("📊 Supported Services:")
-        
-        # Check welcome image accessibility
-        if config.WELCOME_IMAGE_URL:
-            bot_temp = URLShortenerBot(config.BOT_TOKEN)
-            if bot_temp.is_image_accessible(config.WELCOME_IMAGE_URL):
-                print(f"✅ Welcome image is accessible: {config.WELCOME_IMAGE_URL}")
-            else:
-                print(f"❌ Welcome image not accessible, will use text only: {config.WELCOME_IMAGE_URL}")
+        # Build the bot (and its Application) exactly once
+        bot = URLShortenerBot(config.BOT_TOKEN)
         
+        print("📊 Supported Services:")
         for service, info in config.SUPPORTED_SERVICES.items():
-            status = "✅" if not info['requires_key'] or (
-                (service == 'bitly' and config.BITLY_TOKEN) or
-                (service == 'cuttly' and config.CUTTLY_API) or
-                (service == 'gplinks' and config.GPLINKS_API)
-            ) else "❌"
-            print(f"   {status} {info['name']}")
-        
-        bot = URLShortenerBot(config.BOT_TOKEN)
+            status = "✅" if service in _CONFIGURED_SERVICES else "❌"
+            print(f"   {status} {info.name}")
         
         if config.USE_WEBHOOK:
             print(f"🚀 Starting webhook server on port {config.WEBHOOK_PORT}...")
@@ -642,7 +969,7 @@ def main():
     except KeyboardInterrupt:
         print("\n👋 Bot stopped by user")
     except Exception as e:
-        logger.error(f"Failed to start bot: {e}")
+        logger.error("Failed to start bot: %s", e)
         print(f"❌ Failed to start bot: {e}")
 
 if __name__ == '__main__':
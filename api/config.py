@@ -1,30 +1,31 @@
-import os
 from dotenv import load_dotenv
 
-load_dotenv()
+try:
+    from ._env import env, dotenv_path  # imported as part of the api package
+except ImportError:
+    from _env import env, dotenv_path  # api/ itself is on sys.path
+
+_DOTENV_PATH = dotenv_path()
+if _DOTENV_PATH:
+    load_dotenv(_DOTENV_PATH)
 
 # Bot Configuration
-BOT_TOKEN = os.getenv('BOT_TOKEN', 'YOUR_BOT_TOKEN_HERE')
+BOT_TOKEN = env('BOT_TOKEN', 'YOUR_BOT_TOKEN_HERE')
 
-# URL Shortener Services API Keys
 USE_WEBHOOK = True
 WEBHOOK_PORT = 5000
-WEBHOOK_URL = os.environ.get('WEBHOOK_URL')  # Render provides this
-
-BITLY_TOKEN = os.getenv('BITLY_TOKEN', '')
-TINYURL_API = os.getenv('TINYURL_API', '')  # Actually no API key needed, but kept for structure
-CUTTLY_API = os.getenv('CUTTLY_API', '')
-GPLINKS_API = os.getenv('GPLINKS_API', '')
+WEBHOOK_URL = env('WEBHOOK_URL')  # Render provides this
 
 # Optional: Welcome image URL
-WELCOME_IMAGE_URL = ('WELCOME_IMAGE_URL','https://iili.io/Kcbrql9.th.jpg')
+WELCOME_IMAGE_URL = env('WELCOME_IMAGE_URL', 'https://iili.io/Kcbrql9.th.jpg')
 
 # Service Configuration
 SUPPORTED_SERVICES = {
     'bitly': {
         'name': 'Bitly',
         'api_url': 'https://api-ssl.bitly.com/v4/shorten',
-        'requires_key': True
+        'requires_key': True,
+        'env_var': 'BITLY_TOKEN'
     },
     'tinyurl': {
         'name': 'TinyURL',
@@ -34,12 +35,24 @@ SUPPORTED_SERVICES = {
     'cuttly': {
         'name': 'Cuttly',
         'api_url': 'https://cutt.ly/api/api.php',
-        'requires_key': True
+        'requires_key': True,
+        'env_var': 'CUTTLY_API'
     },
     'gplinks': {
         'name': 'GPLinks',
         'api_url': 'https://gplinks.com/api',
         'requires_key': True,
-        'method': 'POST'
+        'method': 'POST',
+        'env_var': 'GPLINKS_API'
     }
 }
+
+# URL Shortener Services API Keys (only read for services listed above)
+API_KEYS = {
+    name: env(service['env_var'], '')
+    for name, service in SUPPORTED_SERVICES.items()
+    if service['requires_key']
+}
+BITLY_TOKEN = API_KEYS.get('bitly', '')
+CUTTLY_API = API_KEYS.get('cuttly', '')
+GPLINKS_API = API_KEYS.get('gplinks', '')